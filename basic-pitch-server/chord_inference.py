@@ -14,22 +14,37 @@ stable, musically meaningful chord progressions. It includes:
 7. Expected harmony whitelist filtering
 8. Output stability guarantees
 
+Requires Python 3.10+ (slotted dataclasses and int.bit_count).
+
 Author: Facundo Franchino
 Date: early Nov 2025
 """
 
 import numpy as np
-import scipy.signal
-from typing import List, Dict, Tuple, Optional, Set
-from dataclasses import dataclass
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import List, Dict, Tuple
+from dataclasses import dataclass, replace
 from collections import Counter, defaultdict
 import logging
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # numba is optional: kernels fall back to their NumPy equivalents, or run as plain Python
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed."""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda function: function
+
 logger = logging.getLogger(__name__)
 
 #Data Structures
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NoteEvent:
     """A detected note with timing and pitch information."""
     onset: float
@@ -45,24 +60,77 @@ class NoteEvent:
     def pitch_class(self) -> int:
         return self.pitch % 12
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ChordEvent:
     """A detected chord with timing and musical information."""
     onset: float
     offset: float
     chord_symbol: str
     confidence: float
-    pitch_classes: Set[int]
+    pitch_classes: int  # 12-bit mask, bit i set when pitch class i is in the chord
     root_pc: int
     chord_type: str
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class KeyEstimate:
     """Key estimation result."""
     key_pc: int  # 0-11 pitch class
     mode: str   # 'major' or 'minor'
     confidence: float
 
+@dataclass
+class _Notes:
+    """Note events stored as parallel arrays (one entry per note) for internal processing."""
+    onset: np.ndarray
+    offset: np.ndarray
+    pitch: np.ndarray
+    pitch_class: np.ndarray
+    confidence: np.ndarray
+    duration: np.ndarray
+    
+    @classmethod
+    def from_events(cls, events: List[NoteEvent]) -> '_Notes':
+        """Convert note events to columnar arrays."""
+        count = len(events)
+        return cls.from_arrays(
+            np.fromiter((event.onset for event in events), dtype=np.float64, count=count),
+            np.fromiter((event.offset for event in events), dtype=np.float64, count=count),
+            np.fromiter((event.pitch for event in events), dtype=np.int64, count=count),
+            np.fromiter((event.confidence for event in events), dtype=np.float64, count=count)
+        )
+    
+    @classmethod
+    def from_arrays(cls, onset: np.ndarray, offset: np.ndarray, pitch: np.ndarray,
+                    confidence: np.ndarray) -> '_Notes':
+        """Build columnar notes from per-note onset, offset, MIDI pitch and confidence arrays."""
+        onset = np.asarray(onset, dtype=np.float64)
+        offset = np.asarray(offset, dtype=np.float64)
+        pitch = np.asarray(pitch, dtype=np.int64)
+        return cls(onset=onset, offset=offset, pitch=pitch, pitch_class=pitch % 12,
+                   confidence=np.asarray(confidence, dtype=np.float64), duration=offset - onset)
+    
+    def __len__(self) -> int:
+        return len(self.onset)
+    
+    def onset_order(self) -> np.ndarray:
+        """
+        Indices that sort the notes by onset.
+        
+        Notes with the same onset are ordered by the first appearance of their pitch class
+        in the input, then by input position, matching the per-pitch-class grouping the
+        chord windows have always seen; a plain stable sort changes which chord wins ties.
+        """
+        positions = np.arange(len(self.onset))
+        first_appearance = np.full(12, len(self.onset))
+        np.minimum.at(first_appearance, self.pitch_class, positions)
+        return np.lexsort((positions, first_appearance[self.pitch_class], self.onset))
+    
+    def __getitem__(self, index) -> '_Notes':
+        """Select notes with a boolean mask, index array or slice."""
+        return _Notes(onset=self.onset[index], offset=self.offset[index], pitch=self.pitch[index],
+                      pitch_class=self.pitch_class[index], confidence=self.confidence[index],
+                      duration=self.duration[index])
+
 #Configuration
 
 class ChordInferenceConfig:
@@ -97,8 +165,146 @@ class ChordInferenceConfig:
         'add9', '6'                  # Common extensions
     }
 
+# MARK: - Chord Templates
+
+# Note (and key) names by pitch class
+_NOTE_NAMES = ('C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B')
+
+def _pitch_class_mask(pitch_classes) -> int:
+    """Encode pitch classes (or intervals) 0-11 as a 12-bit mask (bit i = pitch class i)."""
+    mask = 0
+    for pc in pitch_classes:
+        mask |= 1 << pc
+    return mask
+
+def _mask_pitch_classes(mask: int) -> List[int]:
+    """Decode a 12-bit pitch-class mask into its pitch classes, in ascending order."""
+    return [pc for pc in range(12) if (mask >> pc) & 1]
+
+def _lowest_pitch_class(mask: int) -> int:
+    """Lowest pitch class set in a non-empty 12-bit pitch-class mask."""
+    return (mask & -mask).bit_length() - 1
+
+# Chord templates as (interval mask, chord type, symbol suffix, base score),
+# in priority order (higher score = better match)
+CHORD_TEMPLATES: List[Tuple[int, str, str, float]] = [
+    # Basic triads FIRST (to maintain stability)
+    (_pitch_class_mask({0, 4, 7}), "major", "", 10),           # Major triad
+    (_pitch_class_mask({0, 3, 7}), "minor", "m", 10),          # Minor triad
+    
+    # 7th chords (common extensions)
+    (_pitch_class_mask({0, 4, 7, 10}), "7", "7", 12),          # Dominant 7th
+    (_pitch_class_mask({0, 3, 7, 10}), "m7", "m7", 12),        # Minor 7th
+    (_pitch_class_mask({0, 4, 7, 11}), "maj7", "maj7", 12),    # Major 7th
+    
+    # Jazz extensions (only when confidence is high)
+    (_pitch_class_mask({0, 3, 7, 10, 2, 5}), "m11", "m11", 14),   # Minor 11th (for jazz)
+    (_pitch_class_mask({0, 4, 7, 2}), "add9", "add9", 11),        # Add9
+    (_pitch_class_mask({0, 4, 7, 9}), "6", "6", 11),              # Major 6th
+    
+    # Altered chords
+    (_pitch_class_mask({0, 3, 6}), "dim", "dim", 9),           # Diminished
+    (_pitch_class_mask({0, 4, 8}), "aug", "aug", 9),           # Augmented
+    
+    # Sus chords
+    (_pitch_class_mask({0, 2, 7}), "sus2", "sus2", 8),         # Sus2
+    (_pitch_class_mask({0, 5, 7}), "sus4", "sus4", 8),         # Sus4
+    
+    # Partial chords (fallback)
+    (_pitch_class_mask({0, 4}), "major", "", 6),               # Just major third
+    (_pitch_class_mask({0, 3}), "minor", "m", 6),              # Just minor third
+    (_pitch_class_mask({0, 7}), "major", "", 4),               # Just perfect fifth
+]
+
+# Column views of CHORD_TEMPLATES for scoring every (root, template) pair at once
+TEMPLATES_MASK = np.array([template[0] for template in CHORD_TEMPLATES], dtype=np.uint16)
+TEMPLATES_SIZE = np.array([template[0].bit_count() for template in CHORD_TEMPLATES])
+TEMPLATES_BASE_SCORE = np.array([template[3] for template in CHORD_TEMPLATES], dtype=np.float64)
+TEMPLATES_IS_MAJOR = np.array([template[1] == 'major' for template in CHORD_TEMPLATES])
+TEMPLATES_IS_MINOR = np.array([template[1] == 'minor' for template in CHORD_TEMPLATES])
+
+# Scale intervals used for key-aware filtering
+MAJOR_SCALE_INTERVALS = [0, 2, 4, 5, 7, 9, 11]  # W-W-H-W-W-W-H
+MINOR_SCALE_INTERVALS = [0, 2, 3, 5, 7, 8, 10]  # Natural minor: W-H-W-W-H-W-W
+
+def _key_id(key_pc: int, mode: str) -> int:
+    """Index of a key (0-23) into _KEY_PC_LUT."""
+    return key_pc * 2 + (mode == 'minor')
+
+# Scale membership of every pitch class (columns) for all 24 keys (rows, see _key_id)
+_KEY_PC_LUT = np.zeros((24, 12), dtype=bool)
+for _key_pc in range(12):
+    _KEY_PC_LUT[_key_id(_key_pc, 'major'), [(_key_pc + i) % 12 for i in MAJOR_SCALE_INTERVALS]] = True
+    _KEY_PC_LUT[_key_id(_key_pc, 'minor'), [(_key_pc + i) % 12 for i in MINOR_SCALE_INTERVALS]] = True
+_KEY_PC_LUT.setflags(write=False)
+
+def _scale_mask(key_pc: int, mode: str) -> np.ndarray:
+    """Boolean mask over the 12 pitch classes marking the scale of a key (read-only)."""
+    return _KEY_PC_LUT[_key_id(key_pc, mode)]
+
 # MARK: - Key Detection
 
+@njit(cache=True)
+def _sum12(values: np.ndarray) -> float:
+    """
+    Sum 12 values with an eight-way unrolled first pass.
+    
+    This follows the order np.sum typically uses for short float64 arrays, but NumPy's
+    reduction order depends on the build and SIMD support, so results agree with np.sum
+    (and the NumPy fallbacks) within floating-point tolerance, not necessarily bit for bit.
+    """
+    total = ((values[0] + values[1]) + (values[2] + values[3])) + \
+            ((values[4] + values[5]) + (values[6] + values[7]))
+    for i in range(8, 12):
+        total += values[i]
+    return total
+
+@njit(cache=True)
+def _estimate_key_kernel(pitch_classes: np.ndarray, durations: np.ndarray, confidences: np.ndarray,
+                         exclude_short_notes: bool, min_duration: float,
+                         profile_centered: np.ndarray, profile_norms: np.ndarray):
+    """
+    Compiled equivalent of the histogram and profile correlation in estimate_key_from_arrays.
+    
+    Returns:
+        Tuple of (key index, 0-11 major and 12-23 minor, or -1 when no note carries weight;
+        correlation of that key)
+    """
+    # Filter short notes if requested (falling back to all notes when none are long enough)
+    long_notes_only = False
+    if exclude_short_notes:
+        for i in range(len(durations)):
+            if durations[i] >= min_duration:
+                long_notes_only = True
+                break
+    
+    # Weighted pitch-class histogram (duration * confidence)
+    pc_weights = np.zeros(12)
+    for i in range(len(pitch_classes)):
+        if long_notes_only and durations[i] < min_duration:
+            continue
+        pc_weights[pitch_classes[i]] += durations[i] * confidences[i]
+    
+    total = _sum12(pc_weights)
+    if total == 0:
+        return -1, 0.0
+    
+    # Normalise and centre the distribution
+    x = pc_weights / total
+    x -= _sum12(x) / 12
+    x_norm = np.sqrt(np.sum(x * x))
+    
+    # Pearson correlation against all 24 keys; the first best key wins
+    best_idx = -1
+    best_correlation = -np.inf
+    for k in range(profile_centered.shape[0]):
+        correlation = np.sum(profile_centered[k] * x) / (profile_norms[k] * x_norm + 1e-12)
+        if correlation > best_correlation:
+            best_idx = k
+            best_correlation = correlation
+    
+    return best_idx, best_correlation
+
 class KeyDetector:
     """Robust key detection using Krumhansl key profiles."""
     
@@ -106,11 +312,6 @@ class KeyDetector:
     MAJOR_PROFILE = np.array([6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88])
     MINOR_PROFILE = np.array([6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17])
     
-    def __init__(self):
-        # Normalise profiles
-        self.major_profile = self.MAJOR_PROFILE / np.sum(self.MAJOR_PROFILE)
-        self.minor_profile = self.MINOR_PROFILE / np.sum(self.MINOR_PROFILE)
-    
     def estimate_key(self, note_events: List[NoteEvent], exclude_short_notes: bool = True) -> KeyEstimate:
         """
         Estimate key using weighted pitch-class distribution and key profiles.
@@ -125,78 +326,104 @@ class KeyDetector:
         if not note_events:
             return KeyEstimate(key_pc=0, mode='major', confidence=0.0)
         
-        # Filter short notes if requested
-        if exclude_short_notes:
-            filtered_events = [
-                note for note in note_events 
-                if note.duration >= ChordInferenceConfig.MIN_NOTE_DURATION
-            ]
-            if not filtered_events:
-                filtered_events = note_events  # Fallback to all notes
-        else:
-            filtered_events = note_events
-        
-        # Build weighted pitch-class histogram
-        pc_weights = np.zeros(12)
-        
-        for note in filtered_events:
-            pc = note.pitch_class
-            # Weight by duration * confidence
-            weight = note.duration * note.confidence
-            pc_weights[pc] += weight
+        notes = _Notes.from_events(note_events)
+        return self.estimate_key_from_arrays(notes.pitch_class, notes.duration, notes.confidence,
+                                             exclude_short_notes)
+    
+    def estimate_key_from_arrays(self, pitch_classes: np.ndarray, durations: np.ndarray,
+                                 confidences: np.ndarray, exclude_short_notes: bool = True) -> KeyEstimate:
+        """
+        Estimate key from parallel per-note arrays (see estimate_key).
         
-        if np.sum(pc_weights) == 0:
+        Args:
+            pitch_classes: Pitch class (0-11) of each note
+            durations: Duration of each note in seconds
+            confidences: Confidence of each note
+            exclude_short_notes: Whether to exclude notes shorter than MIN_NOTE_DURATION
+            
+        Returns:
+            KeyEstimate with key, mode, and confidence
+        """
+        if len(pitch_classes) == 0:
             return KeyEstimate(key_pc=0, mode='major', confidence=0.0)
         
-        # Normalise
-        pc_weights = pc_weights / np.sum(pc_weights)
-        
-        logger.debug(f"Pitch class distribution: {pc_weights}")
+        if NUMBA_AVAILABLE:
+            best_idx, best_correlation = _estimate_key_kernel(
+                pitch_classes, durations, confidences, exclude_short_notes,
+                ChordInferenceConfig.MIN_NOTE_DURATION, _PROFILE_CENTERED, _PROFILE_NORMS
+            )
+        else:
+            best_idx, best_correlation = self._correlate_key_profiles(
+                pitch_classes, durations, confidences, exclude_short_notes
+            )
         
-        # Test all 24 possible keys (12 major + 12 minor)
-        best_correlation = -1
-        best_key_pc = 0
-        best_mode = 'major'
+        # No note carries any weight
+        if best_idx < 0:
+            return KeyEstimate(key_pc=0, mode='major', confidence=0.0)
         
-        for root_pc in range(12):
-            # Test major key
-            major_correlation = self._correlate_with_profile(pc_weights, root_pc, self.major_profile)
-            if major_correlation > best_correlation:
-                best_correlation = major_correlation
-                best_key_pc = root_pc
-                best_mode = 'major'
-            
-            # Test minor key  
-            minor_correlation = self._correlate_with_profile(pc_weights, root_pc, self.minor_profile)
-            if minor_correlation > best_correlation:
-                best_correlation = minor_correlation
-                best_key_pc = root_pc
-                best_mode = 'minor'
+        best_key_pc = best_idx % 12
+        best_mode = 'major' if best_idx < 12 else 'minor'
         
         # Convert correlation to confidence (0-1 scale)
-        confidence = max(0.0, min(1.0, best_correlation))
+        confidence = float(max(0.0, min(1.0, best_correlation)))
         
-        key_names = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
-        logger.info(f"Estimated key: {key_names[best_key_pc]} {best_mode} (confidence: {confidence:.3f})")
+        logger.info(f"Estimated key: {_NOTE_NAMES[best_key_pc]} {best_mode} (confidence: {confidence:.3f})")
         
         return KeyEstimate(key_pc=best_key_pc, mode=best_mode, confidence=confidence)
     
-    def _correlate_with_profile(self, pc_weights: np.ndarray, root_pc: int, profile: np.ndarray) -> float:
-        """Compute correlation between pitch-class distribution and key profile."""
-        # Rotate profile to match root
-        rotated_profile = np.roll(profile, root_pc)
+    def _correlate_key_profiles(self, pitch_classes: np.ndarray, durations: np.ndarray,
+                                confidences: np.ndarray, exclude_short_notes: bool) -> Tuple[int, float]:
+        """NumPy equivalent of _estimate_key_kernel used when numba is unavailable."""
+        # Weight by duration * confidence
+        weights = durations * confidences
         
-        # Compute Pearson correlation
-        correlation = np.corrcoef(pc_weights, rotated_profile)[0, 1]
+        # Filter short notes if requested
+        if exclude_short_notes:
+            long_notes = durations >= ChordInferenceConfig.MIN_NOTE_DURATION
+            if np.any(long_notes):
+                weights = weights * long_notes
+            # Otherwise fall back to all notes
         
-        # Handle NaN case (when one array is all zeros)
-        if np.isnan(correlation):
-            correlation = 0.0
-            
-        return correlation
+        # Build weighted pitch-class histogram
+        pc_weights = np.bincount(pitch_classes, weights=weights, minlength=12)
+        
+        if np.sum(pc_weights) == 0:
+            return -1, 0.0
+        
+        # Normalise
+        pc_weights = pc_weights / np.sum(pc_weights)
+        
+        logger.debug("Pitch class distribution: %s", pc_weights)
+        
+        # Pearson correlation against all 24 keys (12 major + 12 minor) at once.
+        # A flat distribution has zero variance and correlates to 0 with every key.
+        x = pc_weights - pc_weights.mean()
+        correlations = (_PROFILE_CENTERED @ x) / (_PROFILE_NORMS * np.linalg.norm(x) + 1e-12)
+        
+        best_idx = int(np.argmax(correlations))
+        return best_idx, float(correlations[best_idx])
+
+# Normalised profiles, computed once at import
+_MAJOR_PROFILE_NORM = KeyDetector.MAJOR_PROFILE / np.sum(KeyDetector.MAJOR_PROFILE)
+_MINOR_PROFILE_NORM = KeyDetector.MINOR_PROFILE / np.sum(KeyDetector.MINOR_PROFILE)
+
+# All 24 rotated profiles (rows 0-11 major, 12-23 minor) so every key can be
+# correlated against the pitch-class distribution in one matrix product
+_PROFILE_MATRIX = np.stack(
+    [np.roll(_MAJOR_PROFILE_NORM, r) for r in range(12)] +
+    [np.roll(_MINOR_PROFILE_NORM, r) for r in range(12)]
+)
+_PROFILE_CENTERED = _PROFILE_MATRIX - _PROFILE_MATRIX.mean(axis=1, keepdims=True)
+_PROFILE_NORMS = np.linalg.norm(_PROFILE_CENTERED, axis=1)
 
 # Pitch Smoothing
 
+def _rolling_median(values: np.ndarray, kernel_size: int) -> np.ndarray:
+    """Median filter with an odd kernel, zero-padded at the edges like scipy.signal.medfilt."""
+    half = kernel_size // 2
+    windows = sliding_window_view(np.pad(values, half), kernel_size)
+    return np.partition(windows, half, axis=1)[:, half]
+
 class PitchSmoother:
     """Applies temporal median filtering to pitch activity."""
     
@@ -211,51 +438,127 @@ class PitchSmoother:
             note_events: Raw note events from Basic Pitch
             
         Returns:
-            Smoothed note events with filtered activations
+            Smoothed note events with filtered activations, sorted by onset
         """
         if not note_events:
             return []
         
-        logger.info(f"Applying pitch smoothing with filter size {self.filter_size}")
-        
-        # Group notes by pitch class and sort by onset
-        pc_events = defaultdict(list)
-        for note in note_events:
-            pc_events[note.pitch_class].append(note)
+        notes = _Notes.from_events(note_events)
+        order = notes.onset_order()
+        confidences = self.smooth_confidences(notes.pitch_class[order], notes.confidence[order]).tolist()
         
+        # Update events with smoothed confidences, reusing the ones the filter left unchanged
         smoothed_events = []
+        for index, confidence in zip(order.tolist(), confidences):
+            event = note_events[index]
+            if confidence != event.confidence:
+                event = replace(event, confidence=confidence)
+            smoothed_events.append(event)
         
-        for pc, events in pc_events.items():
-            if len(events) <= 1:
-                smoothed_events.extend(events)
-                continue
-                
-            # Sort by onset time
-            events.sort(key=lambda n: n.onset)
-            
-            # Extract confidence values
-            confidences = [event.confidence for event in events]
+        logger.info(f"Smoothed {len(note_events)} → {len(smoothed_events)} note events")
+        return smoothed_events
+    
+    def smooth_confidences(self, pitch_classes: np.ndarray, confidences: np.ndarray) -> np.ndarray:
+        """
+        Median-filter note confidences over time within each pitch class.
+        
+        Args:
+            pitch_classes: Pitch class (0-11) of each note, with notes sorted by onset
+            confidences: Confidence of each note
             
+        Returns:
+            Smoothed confidences in the same order; pitch classes with fewer notes
+            than the filter size are left unchanged
+        """
+        logger.info(f"Applying pitch smoothing with filter size {self.filter_size}")
+        
+        # A stable sort groups notes by pitch class and keeps each group in onset order
+        order = np.argsort(pitch_classes, kind='stable')
+        group_bounds = np.concatenate([[0], np.flatnonzero(np.diff(pitch_classes[order])) + 1, [len(order)]])
+        
+        smoothed = confidences.copy()
+        for start, end in zip(group_bounds[:-1], group_bounds[1:]):
             # Apply median filter
-            if len(confidences) >= self.filter_size:
-                smoothed_confidences = scipy.signal.medfilt(confidences, kernel_size=self.filter_size)
-                
-                # Update events with smoothed confidences
-                for i, event in enumerate(events):
-                    smoothed_events.append(NoteEvent(
-                        onset=event.onset,
-                        offset=event.offset,
-                        pitch=event.pitch,
-                        confidence=float(smoothed_confidences[i])
-                    ))
-            else:
-                smoothed_events.extend(events)
+            if end - start > 1 and end - start >= self.filter_size:
+                group = order[start:end]
+                smoothed[group] = _rolling_median(confidences[group], self.filter_size)
         
-        logger.info(f"Smoothed {len(note_events)} → {len(smoothed_events)} note events")
-        return smoothed_events
+        return smoothed
 
 # MARK: - Chord Window Smoothing
 
+def _accumulated_grid(start: float, stop: float, step: float, inclusive: bool) -> np.ndarray:
+    """
+    Time grid start, start + step, ... up to stop (inclusive or exclusive).
+    
+    Points are accumulated one step at a time with a sequential cumsum, so they round
+    exactly like a `t += step` loop; computing start + i * step instead rounds differently
+    on long inputs and shifts chord boundaries by a whole step.
+    """
+    num_points = int(np.floor((stop - start) / step)) + 2  # One spare point for rounding
+    grid = np.cumsum(np.concatenate(([start], np.full(num_points - 1, step))))
+    return grid[grid <= stop] if inclusive else grid[grid < stop]
+
+@njit(cache=True)
+def _mode_filter_kernel(symbol_ids: np.ndarray, window: int, num_symbols: int) -> np.ndarray:
+    """Sliding-window mode of symbol ids (-1 = no chord), with incremental symbol counts."""
+    length = len(symbol_ids)
+    result = np.empty(length, dtype=np.int64)
+    counts = np.zeros(num_symbols, dtype=np.int64)
+    counted_start = 0
+    counted_end = 0
+    
+    for i in range(length):
+        window_start = max(0, i - window // 2)
+        window_end = min(length, window_start + window)
+        
+        # Slide the counted range to [window_start, window_end)
+        while counted_end < window_end:
+            if symbol_ids[counted_end] >= 0:
+                counts[symbol_ids[counted_end]] += 1
+            counted_end += 1
+        while counted_start < window_start:
+            if symbol_ids[counted_start] >= 0:
+                counts[symbol_ids[counted_start]] -= 1
+            counted_start += 1
+        
+        # Most common symbol; ties go to the one that appears first in the window
+        best = -1
+        best_count = 0
+        for j in range(window_start, window_end):
+            symbol = symbol_ids[j]
+            if symbol >= 0 and counts[symbol] > best_count:
+                best = symbol
+                best_count = counts[symbol]
+        result[i] = best
+    
+    return result
+
+def _mode_filter_numpy(symbol_ids: np.ndarray, window: int) -> np.ndarray:
+    """NumPy equivalent of _mode_filter_kernel used when numba is unavailable."""
+    length = len(symbol_ids)
+    window_starts = np.maximum(np.arange(length) - window // 2, 0)
+    
+    # Pad with "no chord" so windows clipped at the end keep a fixed width
+    padded = np.concatenate([symbol_ids, np.full(window, -1, dtype=symbol_ids.dtype)])
+    windows = sliding_window_view(padded, window)[window_starts]
+    
+    # Occurrences of each entry's symbol within its window ("no chord" never counts)
+    counts = (windows[:, :, None] == windows[:, None, :]).sum(axis=2)
+    counts[windows < 0] = 0
+    
+    # argmax returns the first position holding the most common symbol
+    best_positions = np.argmax(counts, axis=1)
+    result = windows[np.arange(length), best_positions]
+    result[counts[np.arange(length), best_positions] == 0] = -1
+    return result
+
+def _mode_filter(symbol_ids: np.ndarray, window: int, num_symbols: int) -> np.ndarray:
+    """Categorical median (most common symbol) filter over a chord symbol timeline."""
+    if NUMBA_AVAILABLE:
+        return _mode_filter_kernel(symbol_ids, window, num_symbols)
+    return _mode_filter_numpy(symbol_ids, window)
+
 class ChordWindowSmoother:
     """Applies 1-second median filter to chord progression windows."""
     
@@ -283,89 +586,59 @@ class ChordWindowSmoother:
         if duration <= 0:
             return chord_events
         
-        # Sample the timeline
-        timeline_points = []
-        current_time = start_time
-        while current_time <= end_time:
-            timeline_points.append(current_time)
-            current_time += timeline_resolution
-        
-        # Map each timeline point to the active chord symbol
-        chord_symbols = []
-        for time_point in timeline_points:
-            active_chord = None
-            for chord in chord_events:
-                if chord.onset <= time_point < chord.offset:
-                    active_chord = chord.chord_symbol
-                    break
-            chord_symbols.append(active_chord or "N")  # "N" for no chord
+        # Sample the timeline (both ends inclusive)
+        timeline = _accumulated_grid(start_time, end_time, timeline_resolution, inclusive=True)
+        
+        # Encode chord symbols as integer ids; "N" (no chord) is -1. The first chord with
+        # each symbol supplies confidence and pitch classes for the smoothed output
+        first_chords: List[ChordEvent] = []
+        symbol_to_id: Dict[str, int] = {}
+        for chord in chord_events:
+            if chord.chord_symbol != "N" and chord.chord_symbol not in symbol_to_id:
+                symbol_to_id[chord.chord_symbol] = len(first_chords)
+                first_chords.append(chord)
+        chord_ids = np.array([symbol_to_id.get(c.chord_symbol, -1) for c in chord_events], dtype=np.int64)
+        chord_onsets = np.array([c.onset for c in chord_events])
+        chord_offsets = np.array([c.offset for c in chord_events])
+        
+        # Map each timeline point to the first chord active at that time
+        active = (chord_onsets[None, :] <= timeline[:, None]) & (timeline[:, None] < chord_offsets[None, :])
+        symbol_ids = np.where(active.any(axis=1), chord_ids[np.argmax(active, axis=1)], -1)
         
         # Apply median filter with 2-second window (4 samples at 0.5s resolution)
         filter_window = max(3, int(1.0 / timeline_resolution))  # 1-second window
         
-        if len(chord_symbols) >= filter_window:
-            smoothed_symbols = []
+        if len(symbol_ids) >= filter_window:
+            # Most common symbol in each window (median-like for categorical data)
+            smoothed_ids = _mode_filter(symbol_ids, filter_window, len(first_chords))
             
-            for i in range(len(chord_symbols)):
-                # Get window around current point
-                window_start = max(0, i - filter_window // 2)
-                window_end = min(len(chord_symbols), window_start + filter_window)
-                window_symbols = chord_symbols[window_start:window_end]
-                
-                # Find most common symbol in window (median-like for categorical data)
-                symbol_counts = Counter(s for s in window_symbols if s != "N")
-                if symbol_counts:
-                    most_common = symbol_counts.most_common(1)[0][0]
-                    smoothed_symbols.append(most_common)
-                else:
-                    smoothed_symbols.append("N")
+            # Convert back to chord events, one per run of identical symbols
+            run_starts = np.concatenate([[0], np.flatnonzero(np.diff(smoothed_ids) != 0) + 1])
+            run_ends = np.append(run_starts[1:], len(smoothed_ids))
             
-            # Convert back to chord events by grouping consecutive identical symbols
             smoothed_chords = []
-            if smoothed_symbols:
-                current_symbol = smoothed_symbols[0]
-                current_start_time = timeline_points[0]
+            for run_start, run_end in zip(run_starts, run_ends):
+                symbol_id = smoothed_ids[run_start]
+                if symbol_id < 0:
+                    continue
                 
-                for i in range(1, len(smoothed_symbols)):
-                    if smoothed_symbols[i] != current_symbol or i == len(smoothed_symbols) - 1:
-                        # End current chord
-                        if current_symbol != "N":
-                            # Find original chord info for confidence and pitch classes
-                            original_chord = next(
-                                (c for c in chord_events if c.chord_symbol == current_symbol), 
-                                None
-                            )
-                            if original_chord:
-                                smoothed_chords.append(ChordEvent(
-                                    onset=current_start_time,
-                                    offset=timeline_points[i-1] + timeline_resolution,
-                                    chord_symbol=current_symbol,
-                                    confidence=original_chord.confidence,
-                                    pitch_classes=original_chord.pitch_classes,
-                                    root_pc=original_chord.root_pc,
-                                    chord_type=original_chord.chord_type
-                                ))
-                        
-                        # Start new chord
-                        current_symbol = smoothed_symbols[i]
-                        current_start_time = timeline_points[i]
+                # Original chord info for confidence and pitch classes
+                original_chord = first_chords[symbol_id]
                 
-                # Handle last chord
-                if current_symbol != "N":
-                    original_chord = next(
-                        (c for c in chord_events if c.chord_symbol == current_symbol), 
-                        None
-                    )
-                    if original_chord:
-                        smoothed_chords.append(ChordEvent(
-                            onset=current_start_time,
-                            offset=end_time,
-                            chord_symbol=current_symbol,
-                            confidence=original_chord.confidence,
-                            pitch_classes=original_chord.pitch_classes,
-                            root_pc=original_chord.root_pc,
-                            chord_type=original_chord.chord_type
-                        ))
+                if run_end == len(smoothed_ids):
+                    offset = end_time
+                else:
+                    offset = float(timeline[run_end - 1]) + timeline_resolution
+                
+                smoothed_chords.append(ChordEvent(
+                    onset=float(timeline[run_start]),
+                    offset=offset,
+                    chord_symbol=original_chord.chord_symbol,
+                    confidence=original_chord.confidence,
+                    pitch_classes=original_chord.pitch_classes,
+                    root_pc=original_chord.root_pc,
+                    chord_type=original_chord.chord_type
+                ))
             
             filtered_count = len(chord_events) - len(smoothed_chords)
             logger.info(f"Median filter: {len(chord_events)} → {len(smoothed_chords)} chords "
@@ -375,6 +648,199 @@ class ChordWindowSmoother:
         
         return chord_events
 
+# MARK: - Window Analysis Kernel
+
+@njit(cache=True)
+def _analyze_window_kernel(onset: np.ndarray, offset: np.ndarray, pitch_class: np.ndarray,
+                           confidence: np.ndarray, first: int, last: int,
+                           start_time: float, end_time: float, weight_by_duration: bool,
+                           min_notes: int, key_pc: int, in_key_roots: int,
+                           tonic_templates: np.ndarray, templates_mask: np.ndarray,
+                           templates_size: np.ndarray, templates_base_score: np.ndarray):
+    """
+    Histogram, threshold and template matching steps for one window.
+    
+    Scans the onset-sorted candidate notes [first, last) and keeps those still sounding at
+    start_time.
+    
+    Returns:
+        Tuple of (template index, root, 12-bit mask of the significant pitch classes, confidence);
+        the template index is -1 when no chord is detected and -2 when no template matches
+    """
+    # Weighted pitch-class histogram, and each pitch class's first note in the window
+    pc_weights = np.zeros(12)
+    pc_first_seen = np.full(12, -1, dtype=np.int64)
+    num_notes = 0
+    for i in range(first, last):
+        if offset[i] <= start_time:
+            continue
+        pc = pitch_class[i]
+        if weight_by_duration:
+            overlap = min(offset[i], end_time) - max(onset[i], start_time)
+            pc_weights[pc] += confidence[i] * max(overlap, 0.0)
+        else:
+            pc_weights[pc] += confidence[i]
+        if pc_first_seen[pc] < 0:
+            pc_first_seen[pc] = num_notes
+        num_notes += 1
+    
+    if num_notes < min_notes:
+        return -1, -1, 0, 0.0
+    
+    # Significant pitch classes: strongest first (ties in order of appearance), at least
+    # 20% of the strongest, max 6
+    max_weight = np.max(pc_weights)
+    threshold = max_weight * 0.2
+    significant = np.empty(6, dtype=np.int64)
+    num_significant = 0
+    taken = np.zeros(12, dtype=np.bool_)
+    while num_significant < 6:
+        best = -1
+        for pc in range(12):
+            if pc_first_seen[pc] < 0 or taken[pc]:
+                continue
+            if best < 0 or pc_weights[pc] > pc_weights[best] or \
+                    (pc_weights[pc] == pc_weights[best] and pc_first_seen[pc] < pc_first_seen[best]):
+                best = pc
+        if best < 0 or pc_weights[best] < threshold:
+            break
+        taken[best] = True
+        significant[num_significant] = best
+        num_significant += 1
+    
+    if num_significant < min_notes:
+        return -1, -1, 0, 0.0
+    
+    pcs_mask = 0
+    lowest = 12
+    for k in range(num_significant):
+        pcs_mask |= 1 << significant[k]
+        lowest = min(lowest, significant[k])
+    
+    # Score every template for every root, weighted by root strength
+    best_score = 0.0
+    best_template = -2
+    best_root = lowest
+    for k in range(num_significant):
+        root = significant[k]
+        intervals = ((pcs_mask >> root) | (pcs_mask << (12 - root))) & 0xFFF
+        
+        root_best_template = -1
+        root_best_score = 0.0
+        for t in range(len(templates_mask)):
+            template = templates_mask[t]
+            if (template & intervals) != template:
+                continue
+            score = templates_base_score[t] * (templates_size[t] / num_significant)
+            if intervals == template:
+                score *= 1.5
+            if (in_key_roots >> root) & 1:
+                score *= 1.2
+            if root == key_pc and tonic_templates[t]:
+                score *= 1.4
+            if score > root_best_score:
+                root_best_template = t
+                root_best_score = score
+        
+        bonus = 1.0
+        if pc_weights[root] > 0:
+            bonus = 1.0 + pc_weights[root] / max_weight * 0.8
+        if root == lowest:
+            bonus *= 1.3
+        score = root_best_score * bonus
+        if score > best_score:
+            best_score = score
+            best_template = root_best_template
+            best_root = root
+    
+    return best_template, best_root, pcs_mask, _sum12(pc_weights) / num_notes
+
+@njit(cache=True, nogil=True)
+def _analyze_windows_kernel(onset: np.ndarray, offset: np.ndarray, pitch_class: np.ndarray,
+                            confidence: np.ndarray, window_starts: np.ndarray, window_ends: np.ndarray,
+                            candidates_starts: np.ndarray, candidates_ends: np.ndarray,
+                            weight_by_duration: bool, min_notes: int, key_pc: int, in_key_roots: int,
+                            tonic_templates: np.ndarray, templates_mask: np.ndarray,
+                            templates_size: np.ndarray, templates_base_score: np.ndarray):
+    """
+    Run _analyze_window_kernel over every window, one result row per window.
+    
+    Windows only hold a handful of notes each, so this stays single-threaded: it releases
+    the GIL and is safe to call from several request threads at once.
+    """
+    num_windows = len(window_starts)
+    templates = np.empty(num_windows, dtype=np.int64)
+    roots = np.empty(num_windows, dtype=np.int64)
+    pcs_masks = np.empty(num_windows, dtype=np.int64)
+    confidences = np.empty(num_windows)
+    
+    for w in range(num_windows):
+        templates[w], roots[w], pcs_masks[w], confidences[w] = _analyze_window_kernel(
+            onset, offset, pitch_class, confidence, candidates_starts[w], candidates_ends[w],
+            window_starts[w], window_ends[w], weight_by_duration, min_notes, key_pc, in_key_roots,
+            tonic_templates, templates_mask, templates_size, templates_base_score
+        )
+    
+    return templates, roots, pcs_masks, confidences
+
+# MARK: - Chord Merging
+
+@njit(cache=True)
+def _merge_kernel(onset: np.ndarray, offset: np.ndarray, symbol_id: np.ndarray, root_pc: np.ndarray,
+                  type_id: np.ndarray, confidence: np.ndarray, pcs_mask: np.ndarray,
+                  merge_threshold: float):
+    """
+    Single-pass scan grouping adjacent chords that _finalize_chords merges.
+    
+    Returns:
+        Tuple of (index of each group's first chord, merged offset, merged confidence,
+        union of pitch-class masks), one entry per output chord
+    """
+    num_chords = len(onset)
+    group_start = np.empty(num_chords, dtype=np.int64)
+    group_offset = np.empty(num_chords)
+    group_confidence = np.empty(num_chords)
+    group_mask = np.empty(num_chords, dtype=np.int64)
+    
+    num_groups = 0
+    current = 0
+    current_offset = offset[0]
+    current_confidence = confidence[0]
+    current_mask = pcs_mask[0]
+    
+    for i in range(1, num_chords):
+        time_gap = onset[i] - current_offset
+        
+        same_chord = symbol_id[current] == symbol_id[i]
+        similar_chord = root_pc[current] == root_pc[i] and type_id[current] == type_id[i]
+        close_in_time = time_gap <= merge_threshold
+        overlapping = onset[i] < current_offset
+        
+        if (same_chord and (close_in_time or overlapping)) or (similar_chord and overlapping):
+            # Keep the first chord's symbol; confidence is a running pairwise average
+            current_offset = max(current_offset, offset[i])
+            current_confidence = (current_confidence + confidence[i]) / 2
+            current_mask |= pcs_mask[i]
+        else:
+            group_start[num_groups] = current
+            group_offset[num_groups] = current_offset
+            group_confidence[num_groups] = current_confidence
+            group_mask[num_groups] = current_mask
+            num_groups += 1
+            current = i
+            current_offset = offset[i]
+            current_confidence = confidence[i]
+            current_mask = pcs_mask[i]
+    
+    group_start[num_groups] = current
+    group_offset[num_groups] = current_offset
+    group_confidence[num_groups] = current_confidence
+    group_mask[num_groups] = current_mask
+    num_groups += 1
+    
+    return (group_start[:num_groups], group_offset[:num_groups],
+            group_confidence[:num_groups], group_mask[:num_groups])
+
 # MARK: - Chord Inference Engine
 
 class ChordInferenceEngine:
@@ -396,26 +862,35 @@ class ChordInferenceEngine:
         Returns:
             Tuple of (chord_events, key_estimate)
         """
-        logger.info(f"Starting chord inference for {len(note_events)} note events")
-        self.stats.clear()
-        
-        # Step 1: Apply pitch smoothing
-        smoothed_events = self.pitch_smoother.smooth_pitch_activity(note_events)
-        self.stats['smoothed_notes'] = len(smoothed_events)
+        notes = _Notes.from_events(note_events)
+        return self.infer_chords_from_arrays(notes.onset, notes.offset, notes.pitch, notes.confidence)
+    
+    def infer_chords_from_arrays(self, onsets: np.ndarray, offsets: np.ndarray, pitches: np.ndarray,
+                                 confidences: np.ndarray) -> Tuple[List[ChordEvent], KeyEstimate]:
+        """
+        Chord inference pipeline over parallel per-note arrays (see infer_chords).
         
-        # Step 2: Filter minimum duration notes
-        filtered_events = self._filter_short_notes(smoothed_events)
-        self.stats['duration_filtered'] = len(note_events) - len(filtered_events)
+        Args:
+            onsets: Onset of each note in seconds
+            offsets: Offset of each note in seconds
+            pitches: MIDI pitch of each note
+            confidences: Confidence of each note
+            
+        Returns:
+            Tuple of (chord_events, key_estimate)
+        """
+        logger.info(f"Starting chord inference for {len(onsets)} note events")
+        self.stats.clear()
         
-        # Step 3: Estimate global key
-        key_estimate = self.key_detector.estimate_key(filtered_events)
+        # Columnar notes, sorted by onset once; every later stage keeps this order
+        notes = _Notes.from_arrays(onsets, offsets, pitches, confidences)
+        notes = notes[notes.onset_order()]
         
-        # Step 4: Apply key-aware filtering
-        key_filtered_events = self._apply_key_filtering(filtered_events, key_estimate)
-        self.stats['key_filtered'] = len(filtered_events) - len(key_filtered_events)
+        # Steps 1-4: Smooth confidences, estimate the key and mask out short and out-of-key notes
+        keep, key_estimate, scale_mask = self._prepare_notes(notes)
         
         # Step 5: Create time windows and detect chords
-        raw_chords = self._detect_chords_in_windows(key_filtered_events, key_estimate)
+        raw_chords = self._detect_chords_in_windows(notes[keep], key_estimate, scale_mask)
         self.stats['raw_chords'] = len(raw_chords)
         
         # Step 6: Apply enhanced harmony filtering with key awareness
@@ -426,283 +901,160 @@ class ChordInferenceEngine:
         smoothed_chords = self.chord_smoother.smooth_chord_progression(harmony_filtered_chords)
         self.stats['smoothed_chords'] = len(harmony_filtered_chords) - len(smoothed_chords)
         
-        # Step 8: Merge similar adjacent chords
-        merged_chords = self._merge_similar_chords(smoothed_chords)
-        self.stats['merged_chords'] = len(smoothed_chords) - len(merged_chords)
-        
-        # Step 9: Ensure output stability
-        stable_chords = self._ensure_stability(merged_chords)
+        # Steps 8-9: Merge similar adjacent chords and ensure output stability in one pass
+        stable_chords = self._finalize_chords(smoothed_chords)
         self.stats['final_chords'] = len(stable_chords)
         
         self._log_stats()
         
         return stable_chords, key_estimate
     
-    def _filter_short_notes(self, events: List[NoteEvent]) -> List[NoteEvent]:
-        """Remove notes shorter than minimum duration."""
-        filtered = [
-            event for event in events 
-            if event.duration >= ChordInferenceConfig.MIN_NOTE_DURATION
-        ]
+    def _prepare_notes(self, notes: _Notes) -> Tuple[np.ndarray, KeyEstimate, np.ndarray]:
+        """
+        Run the note-level stages over the shared arrays in one pass.
         
-        dropped = len(events) - len(filtered)
-        if dropped > 0:
-            logger.info(f"Dropped {dropped} notes shorter than {ChordInferenceConfig.MIN_NOTE_DURATION}s")
+        Smooths confidences in place, then combines the minimum-duration filter and the
+        key-aware filter into a single mask instead of materialising each filtered stage.
         
-        return filtered
-    
-    def _apply_key_filtering(self, events: List[NoteEvent], key_estimate: KeyEstimate) -> List[NoteEvent]:
-        """Filter out-of-key notes with low confidence."""
-        if key_estimate.confidence < 0.5:
-            logger.info("Key estimate confidence too low, skipping key filtering")
-            return events
+        Args:
+            notes: Notes sorted by onset (confidences are overwritten with smoothed values)
+            
+        Returns:
+            Tuple of (mask of notes to keep, key_estimate, scale mask of the estimated key)
+        """
+        # Step 1: Apply pitch smoothing
+        notes.confidence[:] = self.pitch_smoother.smooth_confidences(notes.pitch_class, notes.confidence)
+        self.stats['smoothed_notes'] = len(notes)
         
-        # Define scale pitch classes for the estimated key
-        if key_estimate.mode == 'major':
-            # Major scale intervals: W-W-H-W-W-W-H
-            scale_intervals = [0, 2, 4, 5, 7, 9, 11]
+        # Step 2: Filter minimum duration notes
+        long_notes = notes.duration >= ChordInferenceConfig.MIN_NOTE_DURATION
+        num_long = int(np.count_nonzero(long_notes))
+        self.stats['duration_filtered'] = len(notes) - num_long
+        if num_long < len(notes):
+            logger.info(f"Dropped {len(notes) - num_long} notes shorter than "
+                       f"{ChordInferenceConfig.MIN_NOTE_DURATION}s")
+        
+        # Step 3: Estimate global key from the long notes only (exclude_short_notes
+        # weights exactly those, so no filtered copies of the arrays are needed)
+        if num_long > 0:
+            key_estimate = self.key_detector.estimate_key_from_arrays(
+                notes.pitch_class, notes.duration, notes.confidence, exclude_short_notes=True
+            )
         else:
-            # Natural minor scale intervals: W-H-W-W-H-W-W  
-            scale_intervals = [0, 2, 3, 5, 7, 8, 10]
-        
-        scale_pcs = {(key_estimate.key_pc + interval) % 12 for interval in scale_intervals}
+            key_estimate = KeyEstimate(key_pc=0, mode='major', confidence=0.0)
         
-        filtered_events = []
-        dropped_count = 0
+        # Scale of the estimated key, shared by every key-aware stage
+        scale_mask = _scale_mask(key_estimate.key_pc, key_estimate.mode)
         
-        for event in events:
-            pc = event.pitch_class
-            
-            # If note is in key, always keep it
-            if pc in scale_pcs:
-                filtered_events.append(event)
-            # If note is out of key but has high confidence, keep it
-            elif event.confidence >= ChordInferenceConfig.KEY_FILTER_CONFIDENCE_THRESHOLD:
-                filtered_events.append(event)
-            # Otherwise drop it
-            else:
-                dropped_count += 1
+        # Step 4: Apply key-aware filtering
+        if key_estimate.confidence < 0.5:
+            logger.info("Key estimate confidence too low, skipping key filtering")
+            keep = long_notes
+        else:
+            # Keep in-key notes, and out-of-key notes only when they have high confidence
+            keep = long_notes & (scale_mask[notes.pitch_class] |
+                                 (notes.confidence >= ChordInferenceConfig.KEY_FILTER_CONFIDENCE_THRESHOLD))
         
+        dropped_count = num_long - int(np.count_nonzero(keep))
+        self.stats['key_filtered'] = dropped_count
         if dropped_count > 0:
-            key_names = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
-            logger.info(f"Key filtering in {key_names[key_estimate.key_pc]} {key_estimate.mode}: "
+            logger.info(f"Key filtering in {_NOTE_NAMES[key_estimate.key_pc]} {key_estimate.mode}: "
                        f"dropped {dropped_count} out-of-key notes with low confidence")
         
-        return filtered_events
+        return keep, key_estimate, scale_mask
     
-    def _detect_chords_in_windows(self, events: List[NoteEvent], key_estimate: KeyEstimate) -> List[ChordEvent]:
-        """Detect chords using sliding windows with confidence weighting."""
-        if not events:
+    def _detect_chords_in_windows(self, notes: _Notes, key_estimate: KeyEstimate,
+                                  scale_mask: np.ndarray) -> List[ChordEvent]:
+        """Detect chords using sliding windows with confidence weighting (notes sorted by onset)."""
+        if len(notes) == 0:
             return []
         
-        # Sort events by onset time
-        sorted_events = sorted(events, key=lambda e: e.onset)
+        # Roots that earn the in-key bonus (all of them when the key is uncertain)
+        if key_estimate.confidence >= 0.5:
+            in_key_roots = _pitch_class_mask(np.flatnonzero(scale_mask))
+        else:
+            in_key_roots = 0xFFF
         
         # Determine time range
-        start_time = sorted_events[0].onset
-        end_time = max(event.offset for event in sorted_events)
-        
-        chords = []
-        current_time = start_time
-        
-        while current_time < end_time:
-            window_end = current_time + ChordInferenceConfig.WINDOW_SIZE
-            
-            # Find notes active in this window
-            window_notes = [
-                event for event in sorted_events
-                if (event.onset < window_end and event.offset > current_time)
-            ]
-            
-            if len(window_notes) >= ChordInferenceConfig.MIN_NOTES_PER_CHORD:
-                chord = self._analyze_window(window_notes, current_time, window_end, key_estimate)
-                if chord:
-                    chords.append(chord)
-            
-            current_time += ChordInferenceConfig.WINDOW_SIZE - ChordInferenceConfig.WINDOW_OVERLAP
-        
-        logger.info(f"Detected {len(chords)} raw chords from {len(events)} note events")
-        return chords
-    
-    def _analyze_window(self, notes: List[NoteEvent], start_time: float, end_time: float, 
-                       key_estimate: KeyEstimate) -> Optional[ChordEvent]:
-        """Analyse a time window to detect the most likely chord."""
-        if not notes:
-            return None
-        
-        # Build weighted pitch-class histogram
-        pc_weights = defaultdict(float)
-        
-        for note in notes:
-            pc = note.pitch_class
-            
-            # Weight by confidence and duration overlap with window
-            overlap_start = max(note.onset, start_time)
-            overlap_end = min(note.offset, end_time)
-            overlap_duration = max(0, overlap_end - overlap_start)
-            
-            if ChordInferenceConfig.CONFIDENCE_WEIGHT_DURATION:
-                weight = note.confidence * overlap_duration
-            else:
-                weight = note.confidence
-            
-            pc_weights[pc] += weight
-        
-        if not pc_weights:
-            return None
+        start_time = float(notes.onset[0])
+        end_time = float(np.max(notes.offset))
         
-        # Select most significant pitch classes
-        sorted_pcs = sorted(pc_weights.items(), key=lambda x: x[1], reverse=True)
+        # Running maximum of offsets: every note before the first index where it exceeds
+        # a window's start has already ended, so each window only scans its own notes
+        offsets_cummax = np.maximum.accumulate(notes.offset)
         
-        # Keep pitch classes that are at least 20% of the strongest
-        max_weight = sorted_pcs[0][1]
-        threshold = max_weight * 0.2
+        # Window grid
+        step = ChordInferenceConfig.WINDOW_SIZE - ChordInferenceConfig.WINDOW_OVERLAP
+        window_starts = _accumulated_grid(start_time, end_time, step, inclusive=False)
+        window_ends = window_starts + ChordInferenceConfig.WINDOW_SIZE
         
-        significant_pcs = [pc for pc, weight in sorted_pcs if weight >= threshold]
-        significant_pcs = significant_pcs[:6]  # Max 6 notes in a chord
+        # Notes starting before a window ends are candidates; those still sounding are active
+        candidates_starts = np.searchsorted(offsets_cummax, window_starts, side='right')
+        candidates_ends = np.searchsorted(notes.onset, window_ends, side='left')
         
-        if len(significant_pcs) < ChordInferenceConfig.MIN_NOTES_PER_CHORD:
-            return None
-        
-        # Identify chord type with root-strength weighting
-        chord_symbol, chord_type = self._identify_chord(significant_pcs, key_estimate, pc_weights)
-        
-        # Calculate confidence
-        total_weight = sum(pc_weights.values())
-        avg_confidence = total_weight / len(notes) if notes else 0.0
-        
-        return ChordEvent(
-            onset=start_time,
-            offset=end_time,
-            chord_symbol=chord_symbol,
-            confidence=min(avg_confidence, 1.0),
-            pitch_classes=set(significant_pcs),
-            root_pc=min(significant_pcs),  # Simplified root detection
-            chord_type=chord_type
+        chords = self._analyze_windows(
+            notes, window_starts, window_ends, candidates_starts, candidates_ends,
+            key_estimate, in_key_roots
         )
-    
-    def _identify_chord(self, pitch_classes: List[int], key_estimate: KeyEstimate, 
-                       pc_weights: Dict[int, float] = None) -> Tuple[str, str]:
-        """Identify chord symbol and type from pitch classes with root-strength weighting."""
-        if not pitch_classes:
-            return "N", "unknown"
         
-        # Note names
-        note_names = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+        logger.info(f"Detected {len(chords)} raw chords from {len(notes)} note events")
+        return chords
+    
+    def _analyze_windows(self, notes: _Notes, window_starts: np.ndarray, window_ends: np.ndarray,
+                         candidates_starts: np.ndarray, candidates_ends: np.ndarray,
+                         key_estimate: KeyEstimate, in_key_roots: int) -> List[ChordEvent]:
+        """
+        Detect the chord of every window with the window kernel.
         
-        # Try each pitch class as a potential root
-        best_match = None
-        best_score = 0
+        The kernel is the only implementation: without numba it runs as plain Python,
+        which is slower but gives the same chords.
+        """
+        tonic_templates = TEMPLATES_IS_MAJOR if key_estimate.mode == 'major' else TEMPLATES_IS_MINOR
+        
+        results = _analyze_windows_kernel(
+            notes.onset, notes.offset, notes.pitch_class, notes.confidence,
+            window_starts, window_ends, candidates_starts, candidates_ends,
+            ChordInferenceConfig.CONFIDENCE_WEIGHT_DURATION, ChordInferenceConfig.MIN_NOTES_PER_CHORD,
+            key_estimate.key_pc, in_key_roots,
+            tonic_templates, TEMPLATES_MASK, TEMPLATES_SIZE, TEMPLATES_BASE_SCORE
+        )
         
-        for root in pitch_classes:
-            # Convert to intervals from this potential root
-            intervals = [(pc - root) % 12 for pc in pitch_classes]
-            intervals_set = set(intervals)
-            
-            root_name = note_names[root]
-            
-            # ROOT STRENGTH WEIGHTING: Low notes are stronger roots
-            # This fixes the classic C→Am error by preferring C as root when both C and A are present
-            root_strength_bonus = 1.0
-            if pc_weights:
-                # Get the weight of this root
-                root_weight = pc_weights.get(root, 0.0)
-                max_weight = max(pc_weights.values()) if pc_weights else 1.0
-                
-                # Bonus for strong bass notes (fundamental frequency dominance)
-                if root_weight > 0:
-                    normalized_weight = root_weight / max_weight
-                    root_strength_bonus = 1.0 + normalized_weight * 0.8  # Up to 80% bonus
-                
-                # Extra bonus for lowest pitch classes (simulate bass note prominence)
-                if root == min(pitch_classes):
-                    root_strength_bonus *= 1.3  # 30% bonus for lowest note
+        chords = []
+        for window_start, window_end, template, root, pcs_mask, confidence in zip(
+                window_starts.tolist(), window_ends.tolist(), *(result.tolist() for result in results)):
+            if template == -1:
+                continue
             
-            # Score different chord types (higher score = better match)
-            chord_tests = [
-                # Basic triads FIRST (to maintain stability)
-                ({0, 4, 7}, "major", "", 10),           # Major triad
-                ({0, 3, 7}, "minor", "m", 10),          # Minor triad  
-                
-                # 7th chords (common extensions)
-                ({0, 4, 7, 10}, "7", "7", 12),          # Dominant 7th
-                ({0, 3, 7, 10}, "m7", "m7", 12),        # Minor 7th
-                ({0, 4, 7, 11}, "maj7", "maj7", 12),    # Major 7th
-                
-                # Jazz extensions (only when confidence is high)
-                ({0, 3, 7, 10, 2, 5}, "m11", "m11", 14),   # Minor 11th (for jazz)
-                ({0, 4, 7, 2}, "add9", "add9", 11),        # Add9
-                ({0, 4, 7, 9}, "6", "6", 11),              # Major 6th
-                
-                # Altered chords
-                ({0, 3, 6}, "dim", "dim", 9),           # Diminished
-                ({0, 4, 8}, "aug", "aug", 9),           # Augmented
-                
-                # Sus chords
-                ({0, 2, 7}, "sus2", "sus2", 8),         # Sus2
-                ({0, 5, 7}, "sus4", "sus4", 8),         # Sus4
-                
-                # Partial chords (fallback)
-                ({0, 4}, "major", "", 6),               # Just major third
-                ({0, 3}, "minor", "m", 6),              # Just minor third
-                ({0, 7}, "major", "", 4),               # Just perfect fifth
-            ]
+            lowest = _lowest_pitch_class(pcs_mask)
+            if template >= 0:
+                _, chord_type, suffix, _ = CHORD_TEMPLATES[template]
+                chord_symbol = _NOTE_NAMES[root] + suffix
+            else:
+                # Fallback: use lowest pitch class as root with generic type
+                chord_type = "unknown"
+                chord_symbol = f"{_NOTE_NAMES[lowest]}?"
             
-            for required_intervals, chord_type, suffix, base_score in chord_tests:
-                if required_intervals.issubset(intervals_set):
-                    # Calculate match quality
-                    match_ratio = len(required_intervals) / len(intervals_set)
-                    score = base_score * match_ratio
-                    
-                    # Bonus for having exactly the right intervals (no extras)
-                    if intervals_set == required_intervals:
-                        score *= 1.5
-                    
-                    # Apply root strength weighting (THIS IS THE KEY FIX!)
-                    score *= root_strength_bonus
-                    
-                    # Bonus for root being in the key
-                    if self._is_in_key(root, key_estimate):
-                        score *= 1.2
-                    
-                    # Extra bonus for tonic chord (I) in major/minor keys
-                    if root == key_estimate.key_pc:
-                        if (key_estimate.mode == 'major' and chord_type == 'major') or \
-                           (key_estimate.mode == 'minor' and chord_type == 'minor'):
-                            score *= 1.4  # Strong preference for tonic
-                    
-                    if score > best_score:
-                        best_score = score
-                        symbol = root_name + suffix
-                        best_match = (symbol, chord_type, root)
-        
-        if best_match:
-            return best_match[0], best_match[1]  # symbol, chord_type
-        else:
-            # Fallback: use lowest pitch class as root with generic type
-            root = min(pitch_classes)
-            root_name = note_names[root]
-            return f"{root_name}?", "unknown"
-    
-    def _is_in_key(self, pitch_class: int, key_estimate: KeyEstimate) -> bool:
-        """Check if a pitch class is in the estimated key."""
-        if key_estimate.confidence < 0.5:
-            return True  # Don't apply key filtering if key is uncertain
-        
-        # Define scale intervals
-        if key_estimate.mode == 'major':
-            scale_intervals = [0, 2, 4, 5, 7, 9, 11]  # Major scale
-        else:
-            scale_intervals = [0, 2, 3, 5, 7, 8, 10]  # Natural minor scale
+            chords.append(ChordEvent(
+                onset=window_start,
+                offset=window_end,
+                chord_symbol=chord_symbol,
+                confidence=min(confidence, 1.0),
+                pitch_classes=pcs_mask,
+                root_pc=lowest,  # Simplified root detection
+                chord_type=chord_type
+            ))
         
-        scale_pcs = {(key_estimate.key_pc + interval) % 12 for interval in scale_intervals}
-        return pitch_class in scale_pcs
+        return chords
     
     def _apply_harmony_filtering(self, chords: List[ChordEvent], key_estimate: KeyEstimate) -> List[ChordEvent]:
         """Filter chords using expected harmony whitelist and key-aware validation."""
         filtered = []
         weird_chords_removed = 0
         
+        # How often each chord occurs in the progression, counted once up front
+        symbol_counts = Counter(chord.chord_symbol for chord in chords)
+        functional_chords = ChordInferenceConfig.FUNCTIONAL_CHORDS
+        
         for chord in chords:
             # Check if chord contains weird symbols (hallucinations)
             if any(symbol in chord.chord_symbol for symbol in ['?', '!']):
@@ -715,7 +1067,7 @@ class ChordInferenceEngine:
             is_root_in_key = self._is_chord_root_in_key(chord, key_estimate)
             
             # Always keep functional chord types that are in key
-            if chord.chord_type in ChordInferenceConfig.FUNCTIONAL_CHORDS and is_root_in_key:
+            if chord.chord_type in functional_chords and is_root_in_key:
                 filtered.append(chord)
             
             # Be more strict with out-of-key chords
@@ -733,7 +1085,7 @@ class ChordInferenceEngine:
             # Keep in-key chords with reasonable requirements
             elif (chord.confidence >= 0.3 or 
                   (chord.offset - chord.onset) >= 0.6 or
-                  self._chord_repeats(chord, chords)):
+                  symbol_counts[chord.chord_symbol] >= 2):  # Chord repeats in the progression
                 filtered.append(chord)
             
             else:
@@ -749,74 +1101,61 @@ class ChordInferenceEngine:
         if key_estimate.confidence < 0.6:
             return True  # Don't filter if key detection is uncertain
         
-        return self._is_in_key(chord.root_pc, key_estimate)
-    
-    def _chord_repeats(self, target_chord: ChordEvent, all_chords: List[ChordEvent]) -> bool:
-        """Check if a chord type repeats multiple times in the progression."""
-        count = sum(1 for c in all_chords if c.chord_symbol == target_chord.chord_symbol)
-        return count >= 2
+        return bool(_KEY_PC_LUT[_key_id(key_estimate.key_pc, key_estimate.mode), chord.root_pc])
     
-    def _merge_similar_chords(self, chords: List[ChordEvent]) -> List[ChordEvent]:
-        """Merge adjacent chords that are identical or very similar."""
-        if len(chords) <= 1:
-            return chords
-        
-        merged = []
-        current = chords[0]
-        
-        for next_chord in chords[1:]:
-            # Check if chords should be merged
-            time_gap = next_chord.onset - current.offset
-            
-            # More aggressive merging criteria
-            same_chord = current.chord_symbol == next_chord.chord_symbol
-            similar_chord = (current.root_pc == next_chord.root_pc and 
-                           current.chord_type == next_chord.chord_type)
-            close_in_time = time_gap <= ChordInferenceConfig.MERGE_THRESHOLD
-            overlapping = next_chord.onset < current.offset  # Overlapping windows
-            
-            should_merge = (same_chord and (close_in_time or overlapping)) or \
-                          (similar_chord and overlapping)
-            
-            if should_merge:
-                # Merge chords
-                current = ChordEvent(
-                    onset=current.onset,
-                    offset=max(current.offset, next_chord.offset),
-                    chord_symbol=current.chord_symbol,  # Keep the first chord's symbol
-                    confidence=(current.confidence + next_chord.confidence) / 2,
-                    pitch_classes=current.pitch_classes.union(next_chord.pitch_classes),
-                    root_pc=current.root_pc,
-                    chord_type=current.chord_type
-                )
-            else:
-                merged.append(current)
-                current = next_chord
-        
-        merged.append(current)
-        
-        merges = len(chords) - len(merged)
-        if merges > 0:
-            logger.info(f"Merged {merges} similar adjacent chords")
-        
-        return merged
-    
-    def _ensure_stability(self, chords: List[ChordEvent]) -> List[ChordEvent]:
-        """Ensure output stability by enforcing minimum durations and consistency."""
+    def _finalize_chords(self, chords: List[ChordEvent]) -> List[ChordEvent]:
+        """
+        Merge adjacent chords that are identical or very similar, then drop merged chords
+        shorter than the minimum chord duration for output stability.
+        """
         if not chords:
+            self.stats['merged_chords'] = 0
             return []
         
-        stable = []
+        # Columnar view of the chords; symbols and types are compared as interned ids
+        symbol_ids: Dict[str, int] = {}
+        type_ids: Dict[str, int] = {}
+        results = _merge_kernel(
+            np.array([c.onset for c in chords]),
+            np.array([c.offset for c in chords]),
+            np.array([symbol_ids.setdefault(c.chord_symbol, len(symbol_ids)) for c in chords]),
+            np.array([c.root_pc for c in chords]),
+            np.array([type_ids.setdefault(c.chord_type, len(type_ids)) for c in chords]),
+            np.array([c.confidence for c in chords]),
+            np.array([c.pitch_classes for c in chords], dtype=np.int64),
+            ChordInferenceConfig.MERGE_THRESHOLD
+        )
         
-        for chord in chords:
-            duration = chord.offset - chord.onset
-            
-            # Enforce minimum chord duration
-            if duration >= ChordInferenceConfig.MIN_CHORD_DURATION:
-                stable.append(chord)
-            # Skip very short chords unless they're between longer chords of the same type
+        # Enforce the minimum duration per merged group, rebuilding events only for
+        # kept groups that actually merged
+        stable = []
+        min_duration = ChordInferenceConfig.MIN_CHORD_DURATION
+        for start, end, offset, confidence, pcs_mask in zip(
+                results[0].tolist(), results[0][1:].tolist() + [len(chords)],
+                *(result.tolist() for result in results[1:])):
+            first = chords[start]
+            if offset - first.onset < min_duration:
+                continue  # Skip very short chords
+            if end - start == 1:
+                stable.append(first)
+                continue
+            stable.append(ChordEvent(
+                onset=first.onset,
+                offset=offset,
+                chord_symbol=first.chord_symbol,  # Keep the first chord's symbol
+                confidence=confidence,
+                pitch_classes=pcs_mask,
+                root_pc=first.root_pc,
+                chord_type=first.chord_type
+            ))
+        
+        num_merged = len(results[0])
+        merges = len(chords) - num_merged
+        self.stats['merged_chords'] = merges
+        if merges > 0:
+            logger.info(f"Merged {merges} similar adjacent chords")
         
-        filtered_count = len(chords) - len(stable)
+        filtered_count = num_merged - len(stable)
         if filtered_count > 0:
             logger.info(f"Stability filtering removed {filtered_count} short chords")
         
@@ -836,6 +1175,46 @@ class ChordInferenceEngine:
 
 # MARK: - Main Interface Functions
 
+_NOTE_RECORD_DTYPE = np.dtype([('onset', np.float64), ('offset', np.float64),
+                               ('pitch', np.int64), ('confidence', np.float64)])
+
+def _finite_notes(records: np.ndarray) -> np.ndarray:
+    """Mask of the note records whose onset, offset and confidence are all finite."""
+    return np.isfinite(records['onset']) & np.isfinite(records['offset']) & np.isfinite(records['confidence'])
+
+def _parse_note_dicts(raw_notes: List[Dict]) -> np.ndarray:
+    """
+    Parse note event dicts into a structured array with onset, offset, pitch and confidence fields.
+    
+    All notes are parsed in one pass; if any note is malformed or has a non-finite value
+    (None parses to NaN), the notes are validated one at a time instead and the invalid
+    ones are skipped.
+    """
+    try:
+        records = np.fromiter(
+            ((note['onset'], note['offset'], note['pitch'], note['confidence']) for note in raw_notes),
+            dtype=_NOTE_RECORD_DTYPE, count=len(raw_notes)
+        )
+        if np.all(_finite_notes(records)):
+            return records
+    except (KeyError, ValueError, TypeError, OverflowError):
+        pass
+    
+    valid_records = []
+    for note_dict in raw_notes:
+        try:
+            record = np.array(
+                (note_dict['onset'], note_dict['offset'], note_dict['pitch'], note_dict['confidence']),
+                dtype=_NOTE_RECORD_DTYPE
+            )
+            if not _finite_notes(record):
+                raise ValueError("onset, offset and confidence must be finite")
+            valid_records.append(record.item())
+        except (KeyError, ValueError, TypeError, OverflowError) as e:
+            logger.warning(f"Skipping invalid note event {note_dict}: {e}")
+            continue
+    return np.array(valid_records, dtype=_NOTE_RECORD_DTYPE)
+
 def process_note_events(raw_notes: List[Dict]) -> Tuple[List[Dict], Dict]:
     """
     Process raw Basic Pitch note events into stable chord progression.
@@ -848,28 +1227,18 @@ def process_note_events(raw_notes: List[Dict]) -> Tuple[List[Dict], Dict]:
     """
     logger.info("Processing note events for chord inference")
     
-    # Convert input format to NoteEvent objects
-    note_events = []
-    for note_dict in raw_notes:
-        try:
-            note = NoteEvent(
-                onset=float(note_dict['onset']),
-                offset=float(note_dict['offset']),
-                pitch=int(note_dict['pitch']),
-                confidence=float(note_dict['confidence'])
-            )
-            note_events.append(note)
-        except (KeyError, ValueError, TypeError) as e:
-            logger.warning(f"Skipping invalid note event {note_dict}: {e}")
-            continue
+    # Convert input format to a structured array
+    notes = _parse_note_dicts(raw_notes)
     
-    if not note_events:
+    if len(notes) == 0:
         logger.warning("No valid note events found")
         return [], {"key": "C", "mode": "major", "confidence": 0.0}
     
     # Run chord inference
     engine = ChordInferenceEngine()
-    chord_events, key_estimate = engine.infer_chords(note_events)
+    chord_events, key_estimate = engine.infer_chords_from_arrays(
+        notes['onset'], notes['offset'], notes['pitch'], notes['confidence']
+    )
     
     # Convert output format
     chord_dicts = []
@@ -879,12 +1248,11 @@ def process_note_events(raw_notes: List[Dict]) -> Tuple[List[Dict], Dict]:
             "offset": chord.offset,
             "chord": chord.chord_symbol,
             "confidence": chord.confidence,
-            "pitch_classes": list(chord.pitch_classes)
+            "pitch_classes": _mask_pitch_classes(chord.pitch_classes)
         })
     
-    key_names = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
     key_info = {
-        "key": key_names[key_estimate.key_pc],
+        "key": _NOTE_NAMES[key_estimate.key_pc],
         "mode": key_estimate.mode,
         "confidence": key_estimate.confidence
     }
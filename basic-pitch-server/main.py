@@ -16,17 +16,20 @@ import traceback
 import time
 import shutil
 import subprocess
-from typing import List, Optional, Dict
+import threading
+from typing import List, Optional, Dict, Tuple
 import logging
 
 import uvicorn
 from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 import numpy as np
 import basic_pitch
 from basic_pitch import ICASSP_2022_MODEL_PATH
-from basic_pitch.inference import predict
+from basic_pitch.inference import Model, predict
 import librosa
 import soundfile as sf
 
@@ -39,12 +42,21 @@ logger = logging.getLogger(__name__)
 
 # Configuration
 MAX_FILE_SIZE_MB = 50  # 50MB limit
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # Stream uploads to disk in 1MB chunks
 SUPPORTED_FORMATS = {'.wav', '.mp3', '.m4a', '.aac', '.flac', '.ogg'}
+FFMPEG_FORMATS = {'.m4a', '.aac'}  # Formats soundfile can't decode, converted with ffmpeg first
+DEBUG_SAVE_UPLOADS = os.environ.get("BP_DEBUG_SAVE") == "1"  # Set BP_DEBUG_SAVE=1 to keep a copy of every upload
+
+# Basic Pitch model, loaded once per process and shared by every request.
+# Its TFLite interpreter is not thread-safe, so predictions are serialized with this lock
+BASIC_PITCH_MODEL = Model(ICASSP_2022_MODEL_PATH)
+BASIC_PITCH_LOCK = threading.Lock()
 
 app = FastAPI(
     title="Basic Pitch Server",
     description="Audio-to-MIDI transcription service for chord recognition",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware for web client compatibility
@@ -83,6 +95,99 @@ class AnalysisResponse(BaseModel):
     chords: List[ChordEvent]
     key: KeyInfo
 
+def empty_analysis_response() -> ORJSONResponse:
+    """Analysis response with no notes, no chords and the default key."""
+    return ORJSONResponse({
+        "notes": [],
+        "chords": [],
+        "key": {"key": "C", "mode": "major", "confidence": 0.0}
+    })
+
+def predict_notes(audio_path: str, **predict_kwargs):
+    """Run Basic Pitch on the shared model, one prediction at a time."""
+    with BASIC_PITCH_LOCK:
+        return predict(audio_path, model_or_model_path=BASIC_PITCH_MODEL, **predict_kwargs)
+
+def load_audio(audio_path: str, file_ext: str) -> Tuple[Optional[np.ndarray], Optional[int]]:
+    """
+    Load an audio file as mono float32 samples.
+    
+    Reads the file once with soundfile, falling back to librosa once if that fails.
+    Only formats soundfile can't parse (m4a/aac) are converted with ffmpeg first.
+    
+    Args:
+        audio_path: Path to the audio file
+        file_ext: Lower-case file extension, including the dot
+        
+    Returns:
+        Tuple of (audio, sample_rate), or (None, None) if the file couldn't be loaded
+    """
+    converted_path = None
+    
+    try:
+        if file_ext in FFMPEG_FORMATS:
+            logger.info(f"🟠 Converting {file_ext} to WAV with ffmpeg...")
+            converted_path = os.path.splitext(audio_path)[0] + '_ffmpeg.wav'
+            cmd = [
+                'ffmpeg', '-y', '-i', audio_path,
+                '-ar', '44100',  # 44.1kHz
+                '-ac', '1',      # Mono
+                '-c:a', 'pcm_s16le',  # 16-bit PCM
+                converted_path
+            ]
+            try:
+                result = subprocess.run(cmd, capture_output=True, text=True)
+                if result.returncode == 0:
+                    logger.info("   ✅ ffmpeg conversion successful")
+                    audio_path = converted_path
+                else:
+                    logger.warning(f"   ❌ ffmpeg failed: {result.stderr}")
+            except Exception as e:
+                logger.warning(f"   ❌ ffmpeg failed: {e}")
+        
+        try:
+            logger.info("🔵 Loading audio with soundfile...")
+            audio, sr = sf.read(audio_path, dtype='float32', always_2d=False)
+            if audio.ndim > 1:
+                audio = audio.mean(axis=1)  # Convert stereo to mono
+        except Exception as e:
+            logger.warning(f"   ❌ Soundfile failed: {e}")
+            try:
+                logger.info("🟡 Falling back to librosa...")
+                audio, sr = librosa.load(audio_path, sr=None, mono=True)
+            except Exception as e:
+                logger.warning(f"   ❌ Librosa failed: {e}")
+                return None, None
+        
+        if audio.size == 0:
+            logger.warning("   ⚠️ Audio file contains no samples")
+            return None, None
+        
+        logger.info(f"   ✅ Loaded: shape={audio.shape}, dtype={audio.dtype}, sr={sr}")
+        logger.info(f"   Audio range: [{audio.min():.3f}, {audio.max():.3f}]")
+        return audio, int(sr)
+        
+    finally:
+        # Clean up converted file
+        try:
+            if converted_path and os.path.exists(converted_path):
+                os.unlink(converted_path)
+        except OSError:
+            pass
+
+@app.on_event("startup")
+async def warm_up_chord_inference():
+    """Compile the chord inference kernels before the first request instead of during it."""
+    # I-IV-V-I triads, enough to run every stage (key, windows, smoothing, merging)
+    warm_up_notes = [
+        {'onset': 2.0 * i, 'offset': 2.0 * i + 2.0, 'pitch': root + interval, 'confidence': 0.8}
+        for i, root in enumerate((60, 65, 67, 60))
+        for interval in (0, 4, 7)
+    ]
+    start = time.perf_counter()
+    await run_in_threadpool(process_note_events, warm_up_notes)
+    logger.info(f"🔥 Chord inference warmed up in {time.perf_counter() - start:.2f}s")
+
 @app.get("/")
 async def root():
     """Health check endpoint."""
@@ -105,7 +210,9 @@ async def health_check():
             "error": str(e)
         }
 
-@app.post("/analyze", response_model=AnalysisResponse)
+# The response is built from plain dicts and serialized by orjson directly;
+# AnalysisResponse only documents its schema
+@app.post("/analyze", responses={200: {"model": AnalysisResponse}})
 async def analyze_audio(file: UploadFile = File(...)):
     """
     Analyse an audio file and return note events.
@@ -138,178 +245,63 @@ async def analyze_audio(file: UploadFile = File(...)):
         )
     
     temp_input = None
-    temp_wav = None
+    temp_input_path = None
     
     try:
-        # Save uploaded file temporarily
+        # Stream uploaded file to a temporary file, enforcing the size limit as it arrives
         temp_input = tempfile.NamedTemporaryFile(delete=False, suffix=file_ext)
+        temp_input_path = temp_input.name
         try:
-            content = await file.read()
-            temp_input.write(content)
+            total_size = 0
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                total_size += len(chunk)
+                if total_size > MAX_FILE_SIZE_MB * 1024 * 1024:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File too large. Maximum size: {MAX_FILE_SIZE_MB}MB"
+                    )
+                temp_input.write(chunk)
             temp_input.flush()
             os.fsync(temp_input.fileno())  # Force write to disk
-            temp_input_path = temp_input.name
         finally:
             temp_input.close()  # Ensure file is properly closed before reading
         
         logger.info(f"Saved to temp file: {temp_input_path}")
         
-        # 🔍 DEBUGGING: Save a copy of the uploaded file for inspection
-        debug_filename = f"received_from_ios_{int(time.time())}.wav"
-        debug_path = os.path.join(os.path.dirname(temp_input_path), debug_filename)
-        try:
-            import shutil
-            shutil.copy2(temp_input_path, debug_path)
-            logger.info(f"📁 DEBUG: Saved uploaded file copy to: {debug_path}")
-            logger.info(f"   You can inspect this file manually to check format compatibility")
-        except Exception as e:
-            logger.warning(f"Could not save debug copy: {e}")
+        # 🔍 DEBUGGING: Save a copy of the uploaded file for inspection (only with BP_DEBUG_SAVE=1)
+        debug_path = None
+        if DEBUG_SAVE_UPLOADS:
+            debug_filename = f"received_from_ios_{int(time.time())}.wav"
+            debug_path = os.path.join(os.path.dirname(temp_input_path), debug_filename)
+            try:
+                shutil.copy2(temp_input_path, debug_path)
+                logger.info(f"📁 DEBUG: Saved uploaded file copy to: {debug_path}")
+                logger.info(f"   You can inspect this file manually to check format compatibility")
+            except Exception as e:
+                logger.warning(f"Could not save debug copy: {e}")
         
-        # Convert to WAV format if needed
-        if file_ext != '.wav':
-            temp_wav = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
-            temp_wav_path = temp_wav.name
-            temp_wav.close()  # Close handle so we can write to it
-            
-            logger.info(f"Converting {file_ext} to WAV")
-            audio, sr = librosa.load(temp_input_path, sr=None, mono=True)
-            sf.write(temp_wav_path, audio, sr)
-            audio_path = temp_wav_path
-        else:
-            audio_path = temp_input_path
+        audio_path = temp_input_path
         
         logger.info("Running Basic Pitch inference...")
         
-        # Load and inspect audio with multiple robust fallback methods
-        audio = None
-        sr = None
+        # Load audio as mono samples (soundfile, with librosa and ffmpeg fallbacks)
+        # Blocking disk, decode and inference work runs in the threadpool to keep the event loop free
+        audio, sr = await run_in_threadpool(load_audio, audio_path, file_ext)
         
-        # Method 1: Try librosa (standard approach)
-        try:
-            logger.info("🔵 Method 1: Loading audio with librosa...")
-            audio, sr = librosa.load(audio_path, sr=None, mono=True)
-            logger.info(f"   Librosa result: shape={audio.shape}, dtype={audio.dtype}, sr={sr}")
-            
-            if audio.size == 0:
-                logger.warning("   ⚠️ Librosa returned empty array")
-                audio = None
-            else:
-                logger.info(f"   ✅ Librosa success: {len(audio)} samples, duration={len(audio) / sr:.2f}s")
-                logger.info(f"   Audio range: [{audio.min():.3f}, {audio.max():.3f}]")
-                
-        except Exception as e:
-            logger.warning(f"   ❌ Librosa failed: {e}")
-            audio = None
-
-        # Method 2: Try soundfile directly
-        if audio is None or audio.size == 0:
-            try:
-                logger.info("🟡 Method 2: Loading audio with soundfile...")
-                audio, sr = sf.read(audio_path, dtype='float32')
-                if audio.ndim > 1:
-                    audio = audio.mean(axis=1)  # Convert stereo to mono
-                logger.info(f"   Soundfile result: shape={audio.shape}, dtype={audio.dtype}, sr={sr}")
-                
-                if audio.size == 0:
-                    logger.warning("   ⚠️ Soundfile returned empty array")
-                    audio = None
-                else:
-                    logger.info(f"   ✅ Soundfile success: {len(audio)} samples")
-                    logger.info(f"   Audio range: [{audio.min():.3f}, {audio.max():.3f}]")
-                    
-            except Exception as e:
-                logger.warning(f"   ❌ Soundfile failed: {e}")
-                audio = None
-
-        # Method 3: Try ffmpeg conversion + librosa
-        if audio is None or audio.size == 0:
-            try:
-                logger.info("🟠 Method 3: Converting with ffmpeg then loading...")
-                
-                # Use ffmpeg to convert to a standard format
-                converted_path = audio_path.replace('.wav', '_ffmpeg.wav')
-                cmd = [
-                    'ffmpeg', '-y', '-i', audio_path,
-                    '-ar', '44100',  # 44.1kHz
-                    '-ac', '1',      # Mono
-                    '-c:a', 'pcm_s16le',  # 16-bit PCM
-                    converted_path
-                ]
-                
-                result = subprocess.run(cmd, capture_output=True, text=True)
-                if result.returncode == 0:
-                    logger.info(f"   ✅ ffmpeg conversion successful")
-                    
-                    # Now try librosa on the converted file
-                    audio, sr = librosa.load(converted_path, sr=None, mono=True)
-                    logger.info(f"   FFmpeg+librosa result: shape={audio.shape}, dtype={audio.dtype}, sr={sr}")
-                    
-                    if audio.size > 0:
-                        logger.info(f"   ✅ FFmpeg method success: {len(audio)} samples")
-                        logger.info(f"   Audio range: [{audio.min():.3f}, {audio.max():.3f}]")
-                    else:
-                        logger.warning("   ⚠️ FFmpeg conversion produced empty array")
-                        audio = None
-                        
-                    # Clean up converted file
-                    try:
-                        os.unlink(converted_path)
-                    except:
-                        pass
-                else:
-                    logger.warning(f"   ❌ ffmpeg failed: {result.stderr}")
-                    audio = None
-                    
-            except Exception as e:
-                logger.warning(f"   ❌ FFmpeg method failed: {e}")
-                audio = None
-
-        # Method 4: Try pydub as last resort
-        if audio is None or audio.size == 0:
-            try:
-                logger.info("🔴 Method 4: Loading audio with pydub...")
-                from pydub import AudioSegment
-                
-                audio_segment = AudioSegment.from_file(audio_path)
-                if audio_segment.channels > 1:
-                    audio_segment = audio_segment.set_channels(1)
-                    
-                # Convert to numpy array
-                audio = np.array(audio_segment.get_array_of_samples(), dtype=np.float32)
-                audio = audio / (2**15)  # Normalize 16-bit to [-1, 1]
-                sr = audio_segment.frame_rate
-                
-                logger.info(f"   Pydub result: shape={audio.shape}, dtype={audio.dtype}, sr={sr}")
-                
-                if audio.size == 0:
-                    logger.warning("   ⚠️ Pydub returned empty array")
-                    audio = None
-                else:
-                    logger.info(f"   ✅ Pydub success: {len(audio)} samples")
-                    logger.info(f"   Audio range: [{audio.min():.3f}, {audio.max():.3f}]")
-                    
-            except ImportError:
-                logger.error("   ❌ Pydub not installed")
-                audio = None
-            except Exception as e:
-                logger.warning(f"   ❌ Pydub failed: {e}")
-                audio = None
-
         # Final validation
         if audio is None or audio.size == 0:
             logger.error("🚨 ALL AUDIO LOADING METHODS FAILED")
             logger.error(f"   File exists: {os.path.exists(audio_path)}")
             logger.error(f"   File size: {os.path.getsize(audio_path) if os.path.exists(audio_path) else 'N/A'} bytes")
-            logger.error(f"   Debug copy saved to: {debug_path}")
-            logger.error("   Please inspect the debug copy manually to determine the exact format issue")
+            if debug_path:
+                logger.error(f"   Debug copy saved to: {debug_path}")
+                logger.error("   Please inspect the debug copy manually to determine the exact format issue")
+            else:
+                logger.error("   Set BP_DEBUG_SAVE=1 to keep a copy of uploads for inspection")
             
             # Return empty notes instead of crashing
             logger.info("   Returning empty note list instead of crashing")
-            return AnalysisResponse(
-                notes=[],
-                chords=[],
-                key=KeyInfo(key="C", mode="major", confidence=0.0)
-            )
+            return empty_analysis_response()
 
         logger.info(f"✅ Audio successfully loaded: {len(audio)} samples at {sr} Hz, duration={len(audio) / sr:.2f}s")
         
@@ -319,22 +311,27 @@ async def analyze_audio(file: UploadFile = File(...)):
         
         if len(audio) < MIN_LEN:
             logger.info(f"📏 Audio too short ({len(audio)} < {MIN_LEN} samples), padding to 3 seconds...")
-            padded = np.zeros(MIN_LEN, dtype=np.float32)
-            padded[:len(audio)] = audio
-            audio = padded
+            audio = np.pad(audio, (0, MIN_LEN - len(audio)))  # Zero-pad the end, keeping float32
             logger.info(f"   ✅ Padded from {original_length} to {len(audio)} samples")
         
-        # Save padded audio to a temporary file for Basic Pitch
-        padded_path = audio_path.replace('.wav', '_padded.wav')
-        sf.write(padded_path, audio, int(sr))
+        # Basic Pitch only accepts a file path and loads it itself, so the upload is passed
+        # through untouched unless it was padded or needs ffmpeg to decode
+        padded_path = None
+        if len(audio) != original_length or file_ext in FFMPEG_FORMATS:
+            padded_path = os.path.splitext(audio_path)[0] + '_padded.wav'
+            await run_in_threadpool(sf.write, padded_path, audio, int(sr))
+            inference_path = padded_path
+        else:
+            inference_path = audio_path
         
         # Run Basic Pitch prediction with error handling
         try:
-            logger.info("🎵 Running Basic Pitch inference on padded audio...")
+            logger.info(f"🎵 Running Basic Pitch inference on {inference_path}...")
             
             # 🔧 FIX 2: Catch Basic Pitch internal zero-size array crashes
-            model_output, midi_data, note_events = predict(
-                padded_path,
+            model_output, midi_data, note_events = await run_in_threadpool(
+                predict_notes,
+                inference_path,
                 onset_threshold=0.5,
                 frame_threshold=0.3,
                 minimum_note_length=0.127,  # ~1/8 second minimum note
@@ -354,11 +351,7 @@ async def analyze_audio(file: UploadFile = File(...)):
             if "zero-size array" in str(e) or "minimum" in str(e) or "maximum" in str(e):
                 logger.warning(f"⚠️ Basic Pitch internal error (likely empty onset array): {e}")
                 logger.info("   Returning empty notes list instead of crashing")
-                return AnalysisResponse(
-                    notes=[],
-                    chords=[],
-                    key=KeyInfo(key="C", mode="major", confidence=0.0)
-                )
+                return empty_analysis_response()
             else:
                 logger.error(f"Basic Pitch ValueError: {e}")
                 raise
@@ -371,22 +364,15 @@ async def analyze_audio(file: UploadFile = File(...)):
         finally:
             # Clean up padded audio file
             try:
-                if 'padded_path' in locals() and os.path.exists(padded_path):
+                if padded_path and os.path.exists(padded_path):
                     os.unlink(padded_path)
             except:
                 pass
         
-        # Convert note events to our JSON format
-        json_notes = []
-        
         # Handle case where note_events might be empty or None
         if note_events is None or len(note_events) == 0:
             logger.info("📝 No note events detected by Basic Pitch")
-            return AnalysisResponse(
-                notes=[],
-                chords=[],
-                key=KeyInfo(key="C", mode="major", confidence=0.0)
-            )
+            return empty_analysis_response()
         
         logger.info(f"📝 Processing {len(note_events)} note events...")
         
@@ -394,34 +380,33 @@ async def analyze_audio(file: UploadFile = File(...)):
         original_duration = original_length / sr
         logger.info(f"   Original audio duration: {original_duration:.2f}s, filtering notes beyond this time")
         
-        filtered_count = 0
-        for i, note in enumerate(note_events):
-            try:
-                if len(note) < 4:
-                    logger.warning(f"Note {i} has insufficient data: {note}")
-                    continue
-                
-                onset_time = float(note[0])
-                offset_time = float(note[1])
-                
-                # Skip notes that start after the original audio ended (from padding)
-                if onset_time >= original_duration:
-                    filtered_count += 1
-                    continue
-                
-                # Clip notes that extend beyond original audio
-                if offset_time > original_duration:
-                    offset_time = original_duration
-                    
-                json_notes.append(NoteEvent(
-                    onset=onset_time,         # Start time in seconds
-                    offset=offset_time,       # End time in seconds  
-                    pitch=int(note[2]),       # MIDI pitch number
-                    confidence=float(note[3]) # Confidence score
-                ))
-            except (IndexError, ValueError, TypeError) as e:
-                logger.warning(f"Failed to process note {i}: {note}, error: {e}")
-                continue
+        # Stack (onset, offset, pitch, amplitude) of every note into one array
+        raw_notes = [note[:4] for note in note_events if len(note) >= 4]
+        if len(raw_notes) < len(note_events):
+            logger.warning(f"Skipped {len(note_events) - len(raw_notes)} notes with insufficient data")
+        note_array = np.array(raw_notes, dtype=np.float64).reshape(-1, 4)
+        
+        # Skip notes with missing or non-finite values (None becomes NaN in the float array)
+        finite = np.isfinite(note_array).all(axis=1)
+        invalid_count = len(note_array) - int(np.count_nonzero(finite))
+        if invalid_count > 0:
+            logger.warning(f"Skipped {invalid_count} notes with invalid values")
+            note_array = note_array[finite]
+        
+        # Skip notes that start after the original audio ended (from padding)
+        in_original = note_array[:, 0] < original_duration
+        filtered_count = len(note_array) - int(np.count_nonzero(in_original))
+        note_array = note_array[in_original]
+        
+        # Clip notes that extend beyond original audio
+        np.minimum(note_array[:, 1], original_duration, out=note_array[:, 1])
+        
+        # Convert note events to our JSON format
+        note_rows = note_array.tolist()
+        json_notes = [
+            {'onset': onset, 'offset': offset, 'pitch': int(pitch), 'confidence': confidence}
+            for onset, offset, pitch, confidence in note_rows
+        ]
         
         if filtered_count > 0:
             logger.info(f"   🔄 Filtered out {filtered_count} notes from padded region")
@@ -432,52 +417,36 @@ async def analyze_audio(file: UploadFile = File(...)):
         try:
             logger.info("🎼 Running advanced chord inference...")
             
-            # Convert note events to the format expected by chord inference
-            note_dicts = []
-            for note in json_notes:
-                note_dicts.append({
-                    'onset': note.onset,
-                    'offset': note.offset,
-                    'pitch': note.pitch,
-                    'confidence': note.confidence
-                })
-            
-            # Process with advanced chord inference
-            chord_events, key_info = process_note_events(note_dicts)
+            # Process with advanced chord inference (the JSON notes are already in its input format).
+            # Overlapping requests run this from several worker threads at once, which is safe because
+            # its compiled kernels are single-threaded nogil loops. A parallel=True kernel would not be:
+            # numba falls back to its workqueue threading layer when neither tbb nor omp is available,
+            # and workqueue aborts the process if parallel kernels are entered concurrently
+            chord_events, key_info = await run_in_threadpool(process_note_events, json_notes)
             
             logger.info(f"✅ Chord inference complete: {len(chord_events)} chords detected")
             logger.info(f"   Estimated key: {key_info['key']} {key_info['mode']} "
                        f"(confidence: {key_info['confidence']:.3f})")
             
-            # Convert to response format
-            chord_responses = []
-            for chord_dict in chord_events:
-                chord_responses.append(ChordEvent(
-                    onset=chord_dict['onset'],
-                    offset=chord_dict['offset'],
-                    chord=chord_dict['chord'],
-                    confidence=chord_dict['confidence'],
-                    pitch_classes=chord_dict['pitch_classes']
-                ))
-            
-            key_response = KeyInfo(
-                key=key_info['key'],
-                mode=key_info['mode'],
-                confidence=key_info['confidence']
-            )
+            # Chord and key dicts already match the response format
+            chord_responses = chord_events
+            key_response = key_info
             
         except Exception as e:
             logger.error(f"Chord inference failed: {e}")
             logger.error(traceback.format_exc())
             # Return empty chord progression on failure
             chord_responses = []
-            key_response = KeyInfo(key="C", mode="major", confidence=0.0)
+            key_response = {"key": "C", "mode": "major", "confidence": 0.0}
         
-        return AnalysisResponse(
-            notes=json_notes,
-            chords=chord_responses,
-            key=key_response
-        )
+        return ORJSONResponse({
+            "notes": json_notes,
+            "chords": chord_responses,
+            "key": key_response
+        })
+        
+    except HTTPException:
+        raise
         
     except Exception as e:
         logger.error(f"Analysis failed: {str(e)}")
@@ -492,19 +461,12 @@ async def analyze_audio(file: UploadFile = File(...)):
                 logger.info("Cleaned up input temp file")
         except Exception as e:
             logger.warning(f"Failed to clean up input temp file: {e}")
-            
-        try:
-            if temp_wav and hasattr(temp_wav, 'name') and os.path.exists(temp_wav.name):
-                os.unlink(temp_wav.name)
-                logger.info("Cleaned up WAV temp file")
-        except Exception as e:
-            logger.warning(f"Failed to clean up WAV temp file: {e}")
 
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=os.environ.get("UVICORN_RELOAD") == "1",  # Auto-reload for development only
         log_level="info"
     )
\ No newline at end of file
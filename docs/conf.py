@@ -163,6 +163,18 @@ autodoc_default_options = {
     'exclude-members': '__weakref__'
 }
 
+# Heavy server dependencies are mocked so autodoc never loads the Basic Pitch
+# model (TensorFlow) or JIT toolchains just to read docstrings
+autodoc_mock_imports = [
+    'basic_pitch',
+    'tensorflow',
+    'coremltools',
+    'librosa',
+    'soundfile',
+    'numba',
+    'uvicorn',
+]
+
 # Copy button configuration
 copybutton_exclude = '.linenos, .gp'
 copybutton_prompt_text = r'>>> |\.\.\. |\$ |In \[\d*\]: | {2,5}\.\.\.: | {5,8}: '